@@ -1,84 +1,220 @@
 import asyncio
 from mavsdk import System
 import os
+import sys
+import threading
 from datetime import datetime
+import atexit
 import csv
-import time
-
-telemetry_data = {
-    "lat": "N/A",
-    "lon": "N/A",
-    "alt": "N/A",
-    "abs_alt": "N/A",
-    "speed": "N/A",
-    "roll": "N/A",
-    "pitch": "N/A",
-    "yaw": "N/A",
-    "voltage": "N/A",
-    "battery": "N/A",
-    "gps_fix": "N/A",
-    "satellites": "N/A",
-    "flight_mode": "N/A",
-    "armed": "N/A",
-    "rc_signal": "N/A",
-    "health": {
-        "Accelerometer calibration": "N/A",
-        "Armable": "N/A",
-        "Global position": "N/A",
-        "Gyrometer calibration": "N/A",
-        "Home position": "N/A",
-        "Local position": "N/A",
-        "Magnetometer calibration": "N/A",
-    },
+from time import monotonic
+from collections import deque
+from typing import NamedTuple, Optional
+
+# uvloop is an optional, faster event loop; not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Parquet logging is optional and only enabled when pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Health check display labels paired with their snapshot field, in display order
+HEALTH_KEYS = [
+    ("Accelerometer calibration", "health_accelerometer_calibration"),
+    ("Gyrometer calibration", "health_gyrometer_calibration"),
+    ("Magnetometer calibration", "health_magnetometer_calibration"),
+    ("Global position", "health_global_position"),
+    ("Home position", "health_home_position"),
+    ("Local position", "health_local_position"),
+    ("Armable", "health_armable"),
+]
+
+
+# Immutable telemetry snapshot holding raw values (None until first received);
+# field order is the CSV column order
+class Telemetry(NamedTuple):
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    alt: Optional[float] = None
+    abs_alt: Optional[float] = None
+    speed: Optional[float] = None
+    roll: Optional[float] = None
+    pitch: Optional[float] = None
+    yaw: Optional[float] = None
+    voltage: Optional[float] = None
+    battery: Optional[float] = None
+    gps_fix: Optional[str] = None
+    satellites: Optional[int] = None
+    flight_mode: Optional[str] = None
+    armed: Optional[str] = None
+    rc_signal: Optional[float] = None
+    health_accelerometer_calibration: Optional[str] = None
+    health_armable: Optional[str] = None
+    health_global_position: Optional[str] = None
+    health_gyrometer_calibration: Optional[str] = None
+    health_home_position: Optional[str] = None
+    health_local_position: Optional[str] = None
+    health_magnetometer_calibration: Optional[str] = None
+
+
+def fmt(value, spec=""):
+    # Values are formatted only when rendered; missing ones show as N/A
+    return "N/A" if value is None else format(value, spec)
+
+
+# Fetchers publish updates by rebinding this name to a new snapshot, so
+# readers that grab it once per tick always see a consistent state
+telemetry_data = Telemetry()
+
+# Requested stream rates in Hz, matched to the 1 Hz display and logger
+TELEMETRY_RATES_HZ = {
+    "position": 2.0,
+    "attitude_euler": 5.0,
+    "battery": 1.0,
+    "gps_info": 1.0,
+    "rc_status": 1.0,
 }
 
+# Minimum time in seconds between published attitude updates
+ATTITUDE_MIN_INTERVAL = 0.05
+
+# Upper bound in seconds for the telemetry stream retry backoff
+MAX_BACKOFF = 30
+
+# Seconds a connected session must stay up before the reconnect backoff resets
+STABLE_SESSION_TIME = 60
+
+# Longest gap in seconds between CSV rows while telemetry is unchanged
+HEARTBEAT_INTERVAL = 10
+
+# Number of buffered CSV rows written to disk in one go
+FLUSH_EVERY_N = 30
+
+# Longest time in seconds between CSV writes while rows are queued, so a
+# crash loses a bounded amount of data even when few rows are logged
+FLUSH_INTERVAL = 30
+
+# Write the human-readable CSV log
+CSV_LOGGING = True
+
+# Also write a compact binary Parquet log alongside the CSV; opt-in, needs pyarrow
+PARQUET_LOGGING = False
+
+# Number of rows collected before each Parquet row group is written
+PARQUET_BATCH_ROWS = 60
+
+# Seconds after which the Parquet log is closed and a new file started.
+# A Parquet file is only readable once closed (the footer is written last),
+# so after power loss or a kill only the current file is lost
+PARQUET_ROTATE_INTERVAL = 600
+
 # Error tracking system
-error_list = []
 MAX_ERRORS_DISPLAYED = 5
+error_list = deque(maxlen=MAX_ERRORS_DISPLAYED)
 
 
 def add_error(error_msg):
     timestamp = datetime.now().strftime("%H:%M:%S")
+    # The bounded deque keeps only the most recent errors
     error_list.append(f"[{timestamp}] {error_msg}")
-    # Keep only the most recent errors
-    if len(error_list) > MAX_ERRORS_DISPLAYED:
-        error_list.pop(0)
 
 
 async def run():
-    try:
-        drone = System()
-        # drone = System(mavsdk_server_address="localhost", port=50051)
-        await drone.connect(system_address="serial:///dev/ttyUSB0:57600")
-        # await drone.connect(system_address="serial://COM11:57600")
-        print("Connecting to drone...")
-
-        async for state in drone.core.connection_state():
-            if state.is_connected:
-                print("✅ Drone connected!")
-                break
-
-        # Launch all telemetry fetchers
-        tasks = [
-            asyncio.create_task(fetch_position(drone)),
-            asyncio.create_task(fetch_attitude(drone)),
-            asyncio.create_task(fetch_battery(drone)),
-            asyncio.create_task(fetch_gps(drone)),
-            asyncio.create_task(fetch_flight_mode(drone)),
-            asyncio.create_task(fetch_armed_status(drone)),
-            asyncio.create_task(fetch_rc_signal(drone)),
-            asyncio.create_task(fetch_health(drone)),
-            asyncio.create_task(display_loop()),
-            asyncio.create_task(log_to_csv()),
-        ]
-
-        await asyncio.gather(*tasks)
-
-    except Exception as e:
-        add_error(f"Main connection error: {str(e)}")
-        await asyncio.sleep(5)  # Wait before retrying
-        await run()  # Attempt to reconnect
+    attempt = 0
+    while True:
+        session_start = None
+        try:
+            drone = System()
+            # drone = System(mavsdk_server_address="localhost", port=50051)
+            await drone.connect(system_address="serial:///dev/ttyUSB0:57600")
+            # await drone.connect(system_address="serial://COM11:57600")
+            print("Connecting to drone...")
+
+            async for state in drone.core.connection_state():
+                if state.is_connected:
+                    print("✅ Drone connected!")
+                    break
+
+            # Ask the vehicle to stream only as fast as we consume the data;
+            # not every vehicle honours every rate setter
+            for stream, rate_hz in TELEMETRY_RATES_HZ.items():
+                try:
+                    await getattr(drone.telemetry, f"set_rate_{stream}")(rate_hz)
+                except Exception as e:
+                    add_error(f"Set {stream} rate error: {str(e)}")
+
+            # Launch all telemetry fetchers; if one fails the task group
+            # cancels the others so everything restarts together
+            telemetry = drone.telemetry
+            session_start = monotonic()
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(_pump("Position", telemetry.position, _apply_position))
+                tg.create_task(
+                    _pump("Attitude", telemetry.attitude_euler, _apply_attitude)
+                )
+                tg.create_task(_pump("Battery", telemetry.battery, _apply_battery))
+                tg.create_task(_pump("GPS", telemetry.gps_info, _apply_gps))
+                tg.create_task(
+                    _pump("Flight mode", telemetry.flight_mode, _apply_flight_mode)
+                )
+                tg.create_task(_pump("Armed status", telemetry.armed, _apply_armed))
+                tg.create_task(
+                    _pump("RC signal", telemetry.rc_status, _apply_rc_status)
+                )
+                tg.create_task(_pump("Health check", telemetry.health, _apply_health))
+                tg.create_task(ui_and_log())
 
+        except Exception as e:
+            # Task group failures arrive wrapped; report each underlying error
+            errors = e.exceptions if isinstance(e, ExceptionGroup) else [e]
+            for error in errors:
+                add_error(f"Main connection error: {str(error)}")
+            # Wait before reconnecting, backing off on repeated failures. Only a
+            # session that stayed up for a while counts as a fresh start, so one
+            # that fails right after connecting keeps backing off
+            if (
+                session_start is not None
+                and monotonic() - session_start >= STABLE_SESSION_TIME
+            ):
+                attempt = 0
+            await asyncio.sleep(min(2**attempt, 60))
+            attempt += 1
+
+
+if pa is not None:
+    # Column types for the Parquet log, in CSV column order
+    PARQUET_SCHEMA = pa.schema(
+        [
+            ("timestamp", pa.timestamp("us")),
+            ("lat", pa.float64()),
+            ("lon", pa.float64()),
+            ("alt", pa.float32()),
+            ("abs_alt", pa.float32()),
+            ("speed", pa.float32()),
+            ("roll", pa.float32()),
+            ("pitch", pa.float32()),
+            ("yaw", pa.float32()),
+            ("voltage", pa.float32()),
+            ("battery", pa.float32()),
+            ("gps_fix", pa.string()),
+            ("satellites", pa.int32()),
+            ("flight_mode", pa.string()),
+            ("armed", pa.string()),
+            ("rc_signal", pa.float32()),
+            ("health_accelerometer_calibration", pa.string()),
+            ("health_armable", pa.string()),
+            ("health_global_position", pa.string()),
+            ("health_gyrometer_calibration", pa.string()),
+            ("health_home_position", pa.string()),
+            ("health_local_position", pa.string()),
+            ("health_magnetometer_calibration", pa.string()),
+        ]
+    )
 
 # # Store the log file name at script start
 log_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -86,226 +222,427 @@ filename = os.path.join("flight_logs", f"telemetry_log_{log_start_time}.csv")
 os.makedirs("flight_logs", exist_ok=True)
 
 
-async def log_to_csv():
-    header = [
-        "timestamp",
-        "lat",
-        "lon",
-        "alt",
-        "abs_alt",
-        "speed",
-        "roll",
-        "pitch",
-        "yaw",
-        "voltage",
-        "battery",
-        "gps_fix",
-        "satellites",
-        "flight_mode",
-        "armed",
-        "rc_signal",
-        "health_accelerometer_calibration",
-        "health_armable",
-        "health_global_position",
-        "health_gyrometer_calibration",
-        "health_home_position",
-        "health_local_position",
-        "health_magnetometer_calibration",
-    ]
+# Column names shared by the CSV header and the Parquet batches
+LOG_COLUMNS = ["timestamp", *Telemetry._fields]
 
-    while True:
-        # Flatten the health dictionary into the main data
-        flat_data = telemetry_data.copy()
-        health_data = flat_data.pop("health", {})
-
-        # Add timestamp
-        flat_data["timestamp"] = datetime.now().isoformat()
 
-        # Flatten health data by adding it to the main dictionary with prefixed keys
-        for key, value in health_data.items():
-            flat_data[f'health_{key.lower().replace(" ", "_")}'] = value
+class TelemetryLog:
+    # Writes telemetry snapshots to the CSV log and, when enabled, the
+    # Parquet log; files stay open until close() is called
 
-        # Replace 'N/A' values with 0
-        for k, v in flat_data.items():
-            if v == "N/A":
-                flat_data[k] = 0
+    def __init__(self):
+        # CSV rows are queued here and handed to the writer in batches
+        self.rows_buf = []
+        self.last_flush = monotonic()
 
-        # Write to CSV
-        try:
-            # Check if file exists to determine if we need to write headers
-            file_exists = False
-            try:
-                with open(filename, "r") as f:
-                    file_exists = True
-            except FileNotFoundError:
-                pass
-
-            with open(filename, "a", newline="") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=header)
-
-                if not file_exists:
-                    writer.writeheader()
-
-                # Write the data row, only including fields that are in our header
-                row_data = {
-                    k: flat_data.get(k, 0) if flat_data.get(k, 0) != "N/A" else 0
-                    for k in header
-                }
-                writer.writerow(row_data)
-        except Exception as e:
-            print(f"Error writing to CSV: {e}")
-        await asyncio.sleep(1)
+        self.csvfile = None
+        self.writer = None
+        self.parquet_writer = None
+        self.parquet_batch = []
+        self.last_values = None
+        self.last_logged = 0.0
 
+        # The disk write currently running in a worker thread, if any, and a
+        # lock so the files are never closed underneath it
+        self.pending = None
+        self.io_lock = threading.RLock()
 
-async def display_loop():
-    while True:
-        try:
-            os.system("clear")  # Use 'cls' on Windows
-            print("========= PX4 MAVSDK Telemetry =========")
-            print(f"GPS Fix        : {telemetry_data['gps_fix']}")
-            print(f"Satellites     : {telemetry_data['satellites']}")
-            print(f"Latitude       : {telemetry_data['lat']}")
-            print(f"Longitude      : {telemetry_data['lon']}")
-            print(f"Rel Alt (m)    : {telemetry_data['alt']}")
-            print(f"Abs Alt (m)    : {telemetry_data['abs_alt']}")
-            print(f"Roll           : {telemetry_data['roll']}°")
-            print(f"Pitch          : {telemetry_data['pitch']}°")
-            print(f"Yaw            : {telemetry_data['yaw']}°")
-            print(f"Voltage        : {telemetry_data['voltage']} V")
-            print(f"Battery        : {telemetry_data['battery']} %")
-            print(f"Flight Mode    : {telemetry_data['flight_mode']}")
-            print(f"Armed          : {telemetry_data['armed']}")
-            print(f"RC Signal      : {telemetry_data['rc_signal']}")
-
-            print("\n---------- Pre-Arm Health Check ---------")
-            for key, value in telemetry_data["health"].items():
-                print(f"{key:<30}: {value}")
-
-            # Display errors
-            print("\n=========== Recent Errors ===========")
-            if error_list:
-                for error in error_list[
-                    -MAX_ERRORS_DISPLAYED:
-                ]:  # Show only the most recent errors
-                    print(error)
+        # A log that cannot be opened (missing directory, read-only or full
+        # disk) is reported and skipped; the display and streams keep running
+        if CSV_LOGGING:
+            try:
+                self.open_csv()
+            except Exception as e:
+                add_error(f"CSV logging disabled, cannot open log: {str(e)}")
+                if self.csvfile is not None:
+                    self.csvfile.close()
+                self.csvfile = None
+                self.writer = None
+
+        if PARQUET_LOGGING:
+            if pa is None:
+                add_error("Parquet logging needs pyarrow; writing CSV only")
             else:
-                print("No errors recorded")
-            print("=====================================\n")
-
-            await asyncio.sleep(1)
-        except Exception as e:
-            add_error(f"Display loop error: {str(e)}")
-            await asyncio.sleep(1)
-
-
-async def fetch_position(drone):
-    while True:
+                try:
+                    self.open_parquet()
+                except Exception as e:
+                    add_error(f"Parquet logging disabled, cannot open log: {str(e)}")
+                    self.parquet_writer = None
+
+        # Write rows still queued in rows_buf if the task never gets to run
+        # aclose() (e.g. Ctrl-C while the event loop is shutting down). A batch
+        # already handed to a worker thread is covered by aclose() and by
+        # asyncio.run waiting for its executor threads before exit
+        self.closed = False
+        atexit.register(self.close)
+
+    def open_csv(self):
+        # Decide on the header up front, then open the log once and keep
+        # the handle until close()
+        write_header = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self.csvfile = open(filename, "a", newline="", buffering=1 << 16)
+        self.writer = csv.writer(self.csvfile)
+        if write_header:
+            # Written straight away rather than queued, so it is never
+            # counted as a data row or lost with a failed batch
+            self.writer.writerow(LOG_COLUMNS)
+            self.csvfile.flush()
+
+    def sync_write(self, rows):
+        with self.io_lock:
+            self.writer.writerows(rows)
+            self.csvfile.flush()
+            os.fsync(self.csvfile.fileno())
+
+    def open_parquet(self):
+        # Parquet files cannot be appended to, so every logger start
+        # (including after a reconnect) and every rotation gets its own file
+        parquet_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
+        parquet_filename = os.path.join(
+            "flight_logs", f"telemetry_log_{parquet_start_time}.parquet"
+        )
+        self.parquet_writer = pq.ParquetWriter(parquet_filename, PARQUET_SCHEMA)
+        self.parquet_opened = monotonic()
+
+    def sync_write_parquet(self, batch):
+        table = pa.Table.from_pylist(batch, schema=PARQUET_SCHEMA)
+        with self.io_lock:
+            self.parquet_writer.write_table(table)
+
+    def sync_write_and_rotate_parquet(self, batch):
+        with self.io_lock:
+            self.sync_write_parquet(batch)
+            if monotonic() - self.parquet_opened >= PARQUET_ROTATE_INTERVAL:
+                parquet_writer = self.parquet_writer
+                self.parquet_writer = None
+                # The batch is already written; a failure here only ends
+                # Parquet logging, so report it apart from write errors
+                try:
+                    parquet_writer.close()
+                    self.open_parquet()
+                except Exception as e:
+                    add_error(
+                        f"Parquet rotation failed; Parquet logging stopped: {str(e)}"
+                    )
+
+    async def write_in_thread(self, func, data):
+        # Disk writes run in a worker thread to keep the event loop free. The
+        # write is shielded: if this task is cancelled the thread still
+        # finishes it, and aclose() waits for it before closing the files
+        self.pending = asyncio.ensure_future(asyncio.to_thread(func, data))
         try:
-            async for pos in drone.telemetry.position():
-                telemetry_data["lat"] = f"{pos.latitude_deg:.6f}"
-                telemetry_data["lon"] = f"{pos.longitude_deg:.6f}"
-                telemetry_data["alt"] = f"{pos.relative_altitude_m:.2f}"
-                telemetry_data["abs_alt"] = f"{pos.absolute_altitude_m:.2f}"
-        except Exception as e:
-            add_error(f"Position fetch error: {str(e)}")
-            await asyncio.sleep(1)
-
+            await asyncio.shield(self.pending)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.pending = None
+            raise
+        self.pending = None
+
+    async def write(self, snap):
+        # The snapshot is already a flat tuple in column order, so it serves
+        # directly as the row values
+
+        # Skip unchanged telemetry, but still log a heartbeat row
+        # every HEARTBEAT_INTERVAL seconds
+        now = monotonic()
+        if snap != self.last_values or now - self.last_logged >= HEARTBEAT_INTERVAL:
+            self.last_values = snap
+            self.last_logged = now
+            timestamp = datetime.now()
+
+            if self.csvfile is not None:
+                # Build the row in header order, replacing missing values with 0
+                row = [timestamp.isoformat()]
+                row += [v if v is not None else 0 for v in snap]
+                self.rows_buf.append(row)
+
+            if self.parquet_writer is not None:
+                # Parquet keeps missing values as nulls
+                self.parquet_batch.append(dict(zip(LOG_COLUMNS, (timestamp, *snap))))
+
+        # Write buffered rows to CSV in a single writerows call, once enough
+        # have queued up or FLUSH_INTERVAL seconds have passed since the last write
+        if len(self.rows_buf) >= FLUSH_EVERY_N or (
+            self.rows_buf and now - self.last_flush >= FLUSH_INTERVAL
+        ):
+            rows = self.rows_buf
+            self.rows_buf = []
+            self.last_flush = now
+            try:
+                await self.write_in_thread(self.sync_write, rows)
+            except Exception as e:
+                add_error(f"CSV write error, {len(rows)} rows lost: {str(e)}")
+
+        # Write batched rows to Parquet as one row group
+        if len(self.parquet_batch) >= PARQUET_BATCH_ROWS:
+            batch = self.parquet_batch
+            self.parquet_batch = []
+            try:
+                await self.write_in_thread(self.sync_write_and_rotate_parquet, batch)
+            except Exception as e:
+                add_error(f"Parquet write error, {len(batch)} rows lost: {str(e)}")
 
-async def fetch_attitude(drone):
-    while True:
+    async def aclose(self):
+        # Let a write interrupted by cancellation finish in its worker thread
+        # before the files are closed
         try:
-            async for att in drone.telemetry.attitude_euler():
-                telemetry_data["roll"] = f"{att.roll_deg:.2f}"
-                telemetry_data["pitch"] = f"{att.pitch_deg:.2f}"
-                telemetry_data["yaw"] = f"{att.yaw_deg:.2f}"
+            if self.pending is not None:
+                await asyncio.shield(self.pending)
         except Exception as e:
-            add_error(f"Attitude fetch error: {str(e)}")
-            await asyncio.sleep(1)
-
-
-async def fetch_battery(drone):
-    while True:
+            add_error(f"Log write error: {str(e)}")
+        finally:
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        with self.io_lock:
+            self.close_files()
+
+    def close_files(self):
         try:
-            async for batt in drone.telemetry.battery():
-                telemetry_data["voltage"] = f"{batt.voltage_v:.2f}"
-                telemetry_data["battery"] = f"{batt.remaining_percent * 1:.1f}"
-        except Exception as e:
-            add_error(f"Battery fetch error: {str(e)}")
-            await asyncio.sleep(1)
+            if self.csvfile is not None:
+                try:
+                    self.sync_write(self.rows_buf)
+                finally:
+                    self.csvfile.close()
+        finally:
+            if self.parquet_writer is not None:
+                try:
+                    if self.parquet_batch:
+                        self.sync_write_parquet(self.parquet_batch)
+                finally:
+                    self.parquet_writer.close()
+
+
+# Display frame layout, parsed once; filled from the formatted snapshot fields
+DISPLAY_TEMPLATE = (
+    "========= PX4 MAVSDK Telemetry =========\n"
+    "GPS Fix        : {gps_fix}\n"
+    "Satellites     : {satellites}\n"
+    "Latitude       : {lat}\n"
+    "Longitude      : {lon}\n"
+    "Rel Alt (m)    : {alt}\n"
+    "Abs Alt (m)    : {abs_alt}\n"
+    "Roll           : {roll}°\n"
+    "Pitch          : {pitch}°\n"
+    "Yaw            : {yaw}°\n"
+    "Voltage        : {voltage} V\n"
+    "Battery        : {battery} %\n"
+    "Flight Mode    : {flight_mode}\n"
+    "Armed          : {armed}\n"
+    "RC Signal      : {rc_signal}\n"
+)
+
+# Format spec per displayed field; fields not listed use plain str()
+DISPLAY_FORMATS = {
+    "lat": ".6f",
+    "lon": ".6f",
+    "alt": ".2f",
+    "abs_alt": ".2f",
+    "roll": ".2f",
+    "pitch": ".2f",
+    "yaw": ".2f",
+    "voltage": ".2f",
+    "battery": ".1f",
+    "rc_signal": ".1f",
+}
 
 
-async def fetch_gps(drone):
-    while True:
-        try:
-            async for gps in drone.telemetry.gps_info():
-                telemetry_data["gps_fix"] = str(gps.fix_type).replace("FIX_TYPE_", "")
-                telemetry_data["satellites"] = f"{gps.num_satellites}"
-        except Exception as e:
-            add_error(f"GPS fetch error: {str(e)}")
-            await asyncio.sleep(1)
+def _health_section(snap):
+    lines = ["\n---------- Pre-Arm Health Check ---------\n"]
+    for label, field in HEALTH_KEYS:
+        lines.append(f"{label:<30}: {fmt(getattr(snap, field))}\n")
+    return "".join(lines)
 
 
-async def fetch_flight_mode(drone):
-    while True:
-        try:
-            async for mode in drone.telemetry.flight_mode():
-                telemetry_data["flight_mode"] = str(mode).replace("FLIGHT_MODE_", "")
-        except Exception as e:
-            add_error(f"Flight mode fetch error: {str(e)}")
-            await asyncio.sleep(1)
+def _errors_section():
+    lines = ["\n=========== Recent Errors ===========\n"]
+    if error_list:
+        lines.extend(f"{error}\n" for error in error_list)
+    else:
+        lines.append("No errors recorded\n")
+    lines.append("=====================================\n\n")
+    return "".join(lines)
 
 
-async def fetch_armed_status(drone):
-    while True:
-        try:
-            async for armed in drone.telemetry.armed():
-                telemetry_data["armed"] = "Yes" if armed else "No"
-        except Exception as e:
-            add_error(f"Armed status fetch error: {str(e)}")
-            await asyncio.sleep(1)
+def render(snap):
+    values = {
+        name: fmt(value, DISPLAY_FORMATS.get(name, ""))
+        for name, value in zip(Telemetry._fields, snap)
+    }
+    frame = DISPLAY_TEMPLATE.format_map(values)
 
+    # Clear the screen with ANSI codes and draw the whole frame in one write
+    sys.stdout.write(
+        "\x1b[H\x1b[2J" + frame + _health_section(snap) + _errors_section()
+    )
+    sys.stdout.flush()
 
-async def fetch_rc_signal(drone):
-    while True:
-        try:
-            async for rc in drone.telemetry.rc_status():
-                try:
-                    telemetry_data["rc_signal"] = f"{rc.signal_strength_percent:.1f}"
-                except:
-                    telemetry_data["rc_signal"] = "N/A"
-        except Exception as e:
-            add_error(f"RC signal fetch error: {str(e)}")
-            await asyncio.sleep(1)
 
+async def ui_and_log():
+    # Single 1 Hz consumer: each tick takes one snapshot, redraws the display
+    # and logs it, then sleeps until the next tick on the loop clock
+    loop = asyncio.get_running_loop()
+    log = TelemetryLog()
 
-async def fetch_health(drone):
+    # Bind the per-tick callables to locals once
+    clock = loop.time
+    sleep = asyncio.sleep
+    write = log.write
+    try:
+        next_tick = clock()
+        while True:
+            snap = telemetry_data
+            try:
+                render(snap)
+            except Exception as e:
+                add_error(f"Display loop error: {str(e)}")
+            try:
+                await write(snap)
+            except Exception as e:
+                add_error(f"Logging error: {str(e)}")
+
+            # Schedule against absolute tick times so work done each tick does
+            # not accumulate as drift; skip ticks rather than burst if behind
+            next_tick += 1
+            now = clock()
+            if next_tick < now:
+                next_tick = now
+            await sleep(next_tick - now)
+    finally:
+        await log.aclose()
+
+
+async def _pump(name, stream_factory, handler):
+    # Feed every sample of a telemetry stream to handler, resubscribing with
+    # exponential backoff whenever the stream fails or ends
+    backoff = 1
     while True:
         try:
-            async for health in drone.telemetry.health():
-                telemetry_data["health"] = {
-                    "Accelerometer calibration": (
-                        "OK" if health.is_accelerometer_calibration_ok else "FAIL"
-                    ),
-                    "Gyrometer calibration": (
-                        "OK" if health.is_gyrometer_calibration_ok else "FAIL"
-                    ),
-                    "Magnetometer calibration": (
-                        "OK" if health.is_magnetometer_calibration_ok else "FAIL"
-                    ),
-                    "Global position": "OK" if health.is_global_position_ok else "FAIL",
-                    "Home position": "OK" if health.is_home_position_ok else "FAIL",
-                    "Local position": "OK" if health.is_local_position_ok else "FAIL",
-                    "Armable": "OK" if health.is_armable else "FAIL",
-                }
+            async for item in stream_factory():
+                handler(item)
+                backoff = 1
         except Exception as e:
-            add_error(f"Health check fetch error: {str(e)}")
-            await asyncio.sleep(1)
+            add_error(f"{name} fetch error: {str(e)}")
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, MAX_BACKOFF)
+
+
+def _known(value):
+    # MAVSDK reports unknown readings as NaN; store them as None so they show
+    # as N/A and so unchanged samples compare equal for the CSV dedup
+    return None if value != value else value
+
+
+def _apply_position(pos):
+    global telemetry_data
+    telemetry_data = telemetry_data._replace(
+        lat=_known(pos.latitude_deg),
+        lon=_known(pos.longitude_deg),
+        alt=_known(pos.relative_altitude_m),
+        abs_alt=_known(pos.absolute_altitude_m),
+    )
+
+
+last_attitude_update = 0.0
+
+
+def _apply_attitude(att):
+    global telemetry_data, last_attitude_update
+    # Attitude streams far faster than anything reads it; drop
+    # samples arriving within ATTITUDE_MIN_INTERVAL of the last one
+    now = monotonic()
+    if now - last_attitude_update < ATTITUDE_MIN_INTERVAL:
+        return
+    last_attitude_update = now
+    telemetry_data = telemetry_data._replace(
+        roll=_known(att.roll_deg),
+        pitch=_known(att.pitch_deg),
+        yaw=_known(att.yaw_deg),
+    )
+
+
+def _apply_battery(batt):
+    global telemetry_data
+    telemetry_data = telemetry_data._replace(
+        voltage=_known(batt.voltage_v),
+        battery=_known(batt.remaining_percent),
+    )
+
+
+# Enum display names are cached since the values rarely change between samples
+fix_type_names = {}
+flight_mode_names = {}
+
+
+def _apply_gps(gps):
+    global telemetry_data
+    gps_fix = fix_type_names.get(gps.fix_type)
+    if gps_fix is None:
+        gps_fix = fix_type_names[gps.fix_type] = str(gps.fix_type).removeprefix(
+            "FIX_TYPE_"
+        )
+    telemetry_data = telemetry_data._replace(
+        gps_fix=gps_fix,
+        satellites=gps.num_satellites,
+    )
+
+
+def _apply_flight_mode(mode):
+    global telemetry_data
+    flight_mode = flight_mode_names.get(mode)
+    if flight_mode is None:
+        flight_mode = flight_mode_names[mode] = str(mode).removeprefix("FLIGHT_MODE_")
+    telemetry_data = telemetry_data._replace(flight_mode=flight_mode)
+
+
+def _apply_armed(armed):
+    global telemetry_data
+    telemetry_data = telemetry_data._replace(armed="Yes" if armed else "No")
+
+
+def _apply_rc_status(rc):
+    global telemetry_data
+    telemetry_data = telemetry_data._replace(
+        rc_signal=_known(rc.signal_strength_percent)
+    )
+
+
+def _apply_health(health):
+    global telemetry_data
+    telemetry_data = telemetry_data._replace(
+        health_accelerometer_calibration=(
+            "OK" if health.is_accelerometer_calibration_ok else "FAIL"
+        ),
+        health_gyrometer_calibration=(
+            "OK" if health.is_gyrometer_calibration_ok else "FAIL"
+        ),
+        health_magnetometer_calibration=(
+            "OK" if health.is_magnetometer_calibration_ok else "FAIL"
+        ),
+        health_global_position="OK" if health.is_global_position_ok else "FAIL",
+        health_home_position="OK" if health.is_home_position_ok else "FAIL",
+        health_local_position="OK" if health.is_local_position_ok else "FAIL",
+        health_armable="OK" if health.is_armable else "FAIL",
+    )
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(run())
+        if getattr(uvloop, "run", None) is not None:
+            uvloop.run(run())
+        else:
+            # uvloop < 0.18 has no run(); install its event loop policy instead
+            if uvloop is not None:
+                uvloop.install()
+            asyncio.run(run())
     except KeyboardInterrupt:
         print("\nExiting...")
     except Exception as e:
         add_error(f"Fatal error in main: {str(e)}")
+        # The display is no longer running, so print the error as well
+        print(f"Fatal error in main: {str(e)}")